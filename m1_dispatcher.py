@@ -1,10 +1,27 @@
+import asyncio
+import ctypes
+import operator
 import socket
-import json
+import sys
 import time
 import os
-import subprocess
+from collections import deque
 from datetime import datetime
 
+import orjson
+
+from node_monitor import NodeMonitor
+
+try:
+    import uvloop
+except ImportError:  # optional — the stdlib selector loop still works
+    uvloop = None
+
+try:
+    import numpy as np
+except ImportError:  # optional — only pays off once the cell grows
+    np = None
+
 # --- SECURITY HARDENING (PHASE 1) ---
 # Shifted from default 18789 to custom high-range port
 UDP_PORT = 49211
@@ -23,9 +40,71 @@ MT5_COMMON_PATH = os.path.expanduser(
 # War Chest goal
 WAR_CHEST_GOAL = 100_000.0
 
+# 500ms broadcast — sync with Nova's pulse
+BROADCAST_INTERVAL = 0.5
+
+# Resend an unchanged packet at least this often so the dashboard
+# can tell "idle" from "dead"
+KEEPALIVE_SEC = 5.0
+
+# --verbose status line cadence: every 20th tick = one write per 10 s,
+# so the console never sits in the hot loop
+VERBOSE = "--verbose" in sys.argv
+STATUS_EVERY_TICKS = 20
+
 # Strike threshold ($1000 = potential 3-SD wall hit)
 STRIKE_THRESHOLD = 1000.0
 
+# --- MACH VM STATS (no vm_stat fork) ---
+# Forking /usr/bin/vm_stat every tick cost a fork+exec plus text parsing;
+# host_statistics64 gives the same page counters in one library call.
+HOST_VM_INFO64 = 4
+PAGE_SIZE = 16384  # Apple Silicon page size
+
+
+class _VMStatistics64(ctypes.Structure):
+    """mach/vm_statistics.h: struct vm_statistics64 (pack(4))."""
+    _pack_ = 4
+    _fields_ = [
+        ("free_count", ctypes.c_uint32),
+        ("active_count", ctypes.c_uint32),
+        ("inactive_count", ctypes.c_uint32),
+        ("wire_count", ctypes.c_uint32),
+        ("zero_fill_count", ctypes.c_uint64),
+        ("reactivations", ctypes.c_uint64),
+        ("pageins", ctypes.c_uint64),
+        ("pageouts", ctypes.c_uint64),
+        ("faults", ctypes.c_uint64),
+        ("cow_faults", ctypes.c_uint64),
+        ("lookups", ctypes.c_uint64),
+        ("hits", ctypes.c_uint64),
+        ("purges", ctypes.c_uint64),
+        ("purgeable_count", ctypes.c_uint32),
+        ("speculative_count", ctypes.c_uint32),
+        ("decompressions", ctypes.c_uint64),
+        ("compressions", ctypes.c_uint64),
+        ("swapins", ctypes.c_uint64),
+        ("swapouts", ctypes.c_uint64),
+        ("compressor_page_count", ctypes.c_uint32),
+        ("throttled_count", ctypes.c_uint32),
+        ("external_page_count", ctypes.c_uint32),
+        ("internal_page_count", ctypes.c_uint32),
+        ("total_uncompressed_pages_in_compressor", ctypes.c_uint64),
+    ]
+
+
+_HOST_VM_INFO64_COUNT = ctypes.sizeof(_VMStatistics64) // 4
+
+# Resolve libSystem and the host port once at import — both are stable for
+# the life of the process.
+try:
+    _libc = ctypes.CDLL("/usr/lib/libSystem.dylib", use_errno=True)
+    _libc.mach_host_self.restype = ctypes.c_uint
+    _MACH_HOST = _libc.mach_host_self()
+except OSError:
+    _libc = None
+    _MACH_HOST = 0
+
 
 def get_system_health():
     """Get CPU and RAM usage — Apple Silicon optimized, no psutil needed."""
@@ -34,26 +113,17 @@ def get_system_health():
         cpu_count = os.cpu_count() or 8
         cpu_percent = min(100, (load / cpu_count) * 100)
 
-        vm = subprocess.run(
-            ["vm_stat"], capture_output=True, text=True, timeout=1
+        stats = _VMStatistics64()
+        count = ctypes.c_uint(_HOST_VM_INFO64_COUNT)
+        ret = _libc.host_statistics64(
+            _MACH_HOST, HOST_VM_INFO64,
+            ctypes.byref(stats), ctypes.byref(count),
         )
-        page_size = 16384  # Apple Silicon page size
-        stats = {}
-        for line in vm.stdout.split("\n"):
-            if ":" in line:
-                key, val = line.split(":", 1)
-                try:
-                    stats[key.strip()] = int(val.strip().rstrip("."))
-                except ValueError:
-                    pass
+        if ret != 0:
+            raise OSError(f"host_statistics64 failed: kern_return {ret}")
 
-        pages_free = stats.get("Pages free", 0)
-        pages_active = stats.get("Pages active", 0)
-        pages_inactive = stats.get("Pages inactive", 0)
-        pages_wired = stats.get("Pages wired down", 0)
-
-        total_used = (pages_active + pages_wired) * page_size
-        total_free = (pages_free + pages_inactive) * page_size
+        total_used = (stats.active_count + stats.wire_count) * PAGE_SIZE
+        total_free = (stats.free_count + stats.inactive_count) * PAGE_SIZE
         total_mem = total_used + total_free
 
         ram_percent = (total_used / total_mem * 100) if total_mem > 0 else 0
@@ -61,10 +131,10 @@ def get_system_health():
         ram_gb_total = total_mem / (1024 ** 3)
 
         return {
-            "cpu_percent": round(cpu_percent, 1),
-            "ram_percent": round(ram_percent, 1),
-            "ram_used_gb": round(ram_gb_used, 1),
-            "ram_total_gb": round(ram_gb_total, 1),
+            "cpu_percent": cpu_percent,
+            "ram_percent": ram_percent,
+            "ram_used_gb": ram_gb_used,
+            "ram_total_gb": ram_gb_total,
         }
     except Exception as e:
         return {
@@ -76,106 +146,321 @@ def get_system_health():
         }
 
 
-def get_telemetry():
-    """Aggregates data from all active MT5 sandboxes with latency tracking."""
-    nodes = {}
-    now = time.time()
-    try:
-        files = os.listdir(MT5_COMMON_PATH)
-    except OSError:
-        return {}
+# Health cache cadence — loadavg only updates at ~5 s granularity and the
+# vm counters at ~1 s, so sampling at the 2 Hz broadcast rate is wasted work.
+HEALTH_REFRESH_SEC = 2.0
 
-    for file in files:
-        if not file.endswith("_status.json"):
-            continue
-        try:
-            filepath = os.path.join(MT5_COMMON_PATH, file)
-            mtime = os.path.getmtime(filepath)
-            latency_ms = (now - mtime) * 1000
-
-            with open(filepath, "r") as f:
-                data = json.load(f)
-
-            # Use the bot name from JSON, or derive from filename
-            bot_name = data.get("bot", file.replace("_status.json", ""))
-            node_key = bot_name.lower().replace(" ", "_")
-            data["latency_ms"] = round(latency_ms, 1)
-            data.setdefault("status", "RUNNING")
-            data.setdefault("last_action", "—")
-            data.setdefault("current_pnl", 0)
-            data.setdefault("latency_jitter", 0)
-            nodes[node_key] = data
-        except (json.JSONDecodeError, OSError):
-            # File being written to by Nova — skip this cycle, keep other nodes
-            continue
-    return nodes
-
-
-def build_packet(nodes, start_time, strike_log):
-    """Build the full data packet the dashboard expects."""
-    node_data = {}
-    war_chest = 0.0
-    total_latency = 0.0
-    active_nodes = 0
-
-    for node_id, data in nodes.items():
-        node_data[node_id] = {
-            "status": data.get("status", "UNKNOWN"),
-            "last_action": data.get("last_action", "—"),
-            "current_pnl": data.get("current_pnl", 0),
-            "latency_ms": data.get("latency_ms", 0),
-            "latency_jitter": data.get("latency_jitter", 0),
-        }
-        war_chest += float(data.get("current_pnl", 0))
-        total_latency += data.get("latency_ms", 0)
-        active_nodes += 1
+# Single C-level unpack of the five node fields get_telemetry guarantees
+_NODE_FIELDS = operator.itemgetter(
+    "status", "last_action", "current_pnl", "latency_ms", "latency_jitter"
+)
 
-        # Check for 3-SD wall hits
-        pnl = float(data.get("current_pnl", 0))
-        if abs(pnl) > STRIKE_THRESHOLD:
-            strike_log.append({
-                "time": datetime.now().strftime("%H:%M:%S"),
-                "node": node_id,
-                "pnl": pnl,
-                "action": data.get("last_action", "—"),
-            })
-            if len(strike_log) > 50:
-                strike_log.pop(0)
+# Below this many nodes the scalar strike scan beats building an array
+_VECTOR_MIN_NODES = 16
 
-    progress = min(100, max(0, (war_chest / WAR_CHEST_GOAL) * 100))
-    avg_latency = (total_latency / active_nodes) if active_nodes > 0 else 0
 
+def make_packet():
+    """Long-lived packet skeleton — build_packet mutates it in place."""
     return {
-        "timestamp": datetime.now().isoformat(),
-        "uptime_sec": round(time.time() - start_time, 1),
-        "war_chest": round(war_chest, 2),
+        "timestamp": "",
+        "uptime_sec": 0.0,
+        "war_chest": 0.0,
         "war_chest_goal": WAR_CHEST_GOAL,
-        "progress_pct": round(progress, 2),
-        "nodes": node_data,
-        "active_nodes": active_nodes,
-        "avg_latency_ms": round(avg_latency, 1),
-        "system": get_system_health(),
-        "strike_log": strike_log[-10:],
+        "progress_pct": 0.0,
+        "nodes": {},
+        "active_nodes": 0,
+        "avg_latency_ms": 0.0,
+        "system": {},
+        "strike_log": [],
     }
 
 
+def packet_signature(packet):
+    """Fingerprint of the fields worth a broadcast.
+
+    Timestamps, uptime and raw file age are excluded on purpose — an idle
+    cell would otherwise look brand new every tick.
+    """
+    return hash((
+        tuple(
+            (nid, d["status"], d["last_action"], d["current_pnl"],
+             d["latency_jitter"])
+            for nid, d in packet["nodes"].items()
+        ),
+        tuple(
+            (s["time"], s["node"], s["pnl"]) for s in packet["strike_log"]
+        ),
+        tuple(sorted(packet["system"].items())),
+    ))
+
+
+class Dispatcher:
+    """Aggregates node telemetry and broadcasts it to the M4 dashboard."""
+
+    __slots__ = (
+        "sock", "monitors", "strike_log", "start_time", "loop",
+        "_dir_fd", "_packet", "_health_cache", "_health_ts",
+        "_last_sig", "_last_sent", "_tick_count", "_last_send_errno",
+    )
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Roomy send buffer so a congested link doesn't block the tick, and
+        # low-delay TOS so Tailscale/routers can prioritize the telemetry.
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 262144)
+        try:
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_TOS, 0x10)
+        except OSError:
+            pass  # not permitted on some stacks — cosmetic, keep going
+        # Never let a full send buffer block the tick — each packet is a
+        # full snapshot, so one dropped on EWOULDBLOCK is superseded
+        # 500 ms later.
+        self.sock.setblocking(False)
+
+        # One NodeMonitor per status file, created on first sight
+        self.monitors = {}
+        # maxlen evicts the oldest strike in O(1) — no pop(0) list shifting
+        self.strike_log = deque(maxlen=50)
+        self.start_time = time.time()
+        self.loop = None
+        # The MT5 common dir held open once — scans and file opens then
+        # resolve only the basename instead of re-walking the Wine path.
+        self._dir_fd = -1
+        self._packet = make_packet()
+        self._health_cache = None
+        self._health_ts = 0.0
+        self._last_sig = None
+        self._last_sent = 0.0
+        self._tick_count = 0
+        self._last_send_errno = None
+
+    def _get_dir_fd(self):
+        if self._dir_fd < 0:
+            self._dir_fd = fd = os.open(
+                MT5_COMMON_PATH, os.O_RDONLY | os.O_DIRECTORY
+            )
+            # Monitors hold the fd for their relative opens — every
+            # fresh open must repoint them, or they'd keep a dead fd
+            # number that EBADFs (or worse, aliases a recycled fd)
+            for monitor in self.monitors.values():
+                monitor.dir_fd = fd
+        return self._dir_fd
+
+    def _revalidate_dir_fd(self):
+        """Reopen the dir fd if the path no longer names the held directory.
+
+        A Wine prefix reinstall recreates MT5_COMMON_PATH; scans of the
+        old fd keep succeeding against the orphaned inode and report
+        zero nodes forever. Returns True if the fd was replaced.
+        """
+        try:
+            st = os.stat(MT5_COMMON_PATH)
+            fst = os.fstat(self._dir_fd)
+            if (st.st_ino, st.st_dev) == (fst.st_ino, fst.st_dev):
+                return False
+        except OSError:
+            pass  # path gone or fd bad — drop the fd and retry the open
+        os.close(self._dir_fd)
+        self._dir_fd = -1
+        self._get_dir_fd()  # raises if the path is still absent
+        return True
+
+    def get_cached_health(self):
+        """Return the last health sample, refreshing every HEALTH_REFRESH_SEC."""
+        now = time.monotonic()
+        if self._health_cache is None or now - self._health_ts > HEALTH_REFRESH_SEC:
+            self._health_cache = get_system_health()
+            self._health_ts = now
+        return self._health_cache
+
+    def get_telemetry(self):
+        """Aggregates data from all active MT5 sandboxes with latency tracking."""
+        nodes = {}
+        now = time.time()
+        # One scandir pass materializes names and stat results together —
+        # no per-file stat calls before the open.
+        try:
+            with os.scandir(self._get_dir_fd()) as it:
+                entries = [e for e in it if e.name.endswith("_status.json")]
+            if not entries and self._revalidate_dir_fd():
+                # The held fd pointed at an orphaned directory — rescan
+                # the freshly opened one instead of losing this tick
+                with os.scandir(self._dir_fd) as it:
+                    entries = [
+                        e for e in it if e.name.endswith("_status.json")
+                    ]
+        except OSError:
+            return {}
+
+        for entry in entries:
+            try:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+
+                monitor = self.monitors.get(entry.name)
+                if monitor is None:
+                    monitor = self.monitors[entry.name] = NodeMonitor(
+                        entry.name, self._get_dir_fd()
+                    )
+                data = monitor.read(st, now)
+                if data is not None:
+                    nodes[monitor.node_key] = data
+            except OSError:
+                # File being written to by Nova — skip this cycle, keep
+                # other nodes
+                continue
+        return nodes
+
+    def build_packet(self, nodes):
+        """Fill the packet the dashboard expects, reusing the nested dicts."""
+        packet = self._packet
+        node_data = packet["nodes"]
+        strike_log = self.strike_log
+        total_latency = 0.0
+
+        # Struct-of-arrays columns for the summary pass over all nodes
+        node_ids = []
+        pnls = []
+        actions = []
+
+        # One datetime per tick, shared by the packet and any strike entries
+        now = time.time()
+        dt = datetime.fromtimestamp(now)
+        ts_iso = dt.isoformat()
+        ts_hms = dt.strftime("%H:%M:%S")
+
+        for stale in [nid for nid in node_data if nid not in nodes]:
+            del node_data[stale]
+
+        for node_id, data in nodes.items():
+            status, last_action, pnl, latency, jitter = _NODE_FIELDS(data)
+            pnl = float(pnl)
+
+            slot = node_data.get(node_id)
+            if slot is None:
+                slot = node_data[node_id] = {}
+            slot["status"] = status
+            slot["last_action"] = last_action
+            slot["current_pnl"] = pnl
+            slot["latency_ms"] = latency
+            slot["latency_jitter"] = jitter
+
+            total_latency += latency
+            node_ids.append(node_id)
+            pnls.append(pnl)
+            actions.append(last_action)
+
+        active_nodes = len(node_ids)
+        war_chest = sum(pnls)
+
+        # Check for 3-SD wall hits — one pass over the pnl column, SIMD
+        # via numpy once the cell outgrows the scalar scan
+        if np is not None and active_nodes >= _VECTOR_MIN_NODES:
+            strike_idx = np.flatnonzero(
+                np.abs(np.asarray(pnls)) > STRIKE_THRESHOLD
+            )
+        else:
+            strike_idx = [
+                i for i, p in enumerate(pnls) if abs(p) > STRIKE_THRESHOLD
+            ]
+        for i in strike_idx:
+            strike_log.append({
+                "time": ts_hms,
+                "node": node_ids[i],
+                "pnl": pnls[i],
+                "action": actions[i],
+            })
+
+        progress = min(100, max(0, (war_chest / WAR_CHEST_GOAL) * 100))
+        avg_latency = (total_latency / active_nodes) if active_nodes > 0 else 0
+
+        packet["timestamp"] = ts_iso
+        packet["uptime_sec"] = now - self.start_time
+        packet["war_chest"] = war_chest
+        packet["progress_pct"] = progress
+        packet["active_nodes"] = active_nodes
+        packet["avg_latency_ms"] = avg_latency
+        packet["system"] = self.get_cached_health()
+        packet["strike_log"] = list(strike_log)[-10:]
+        return packet
+
+    def run(self):
+        """Drive the broadcast with call_later timers on an event loop."""
+        # No coroutine frame per tick, and uvloop's C event loop when
+        # it's installed.
+        if uvloop is not None:
+            uvloop.install()
+        loop = self.loop = asyncio.new_event_loop()
+
+        # Bind everything the timer callback touches to locals once —
+        # LOAD_FAST instead of LOAD_GLOBAL/LOAD_ATTR chains per tick.
+        build_packet = self.build_packet
+        get_telemetry = self.get_telemetry
+        signature = packet_signature
+        dumps = orjson.dumps
+        sendto = self.sock.sendto
+        monotonic = time.monotonic
+        call_later = loop.call_later
+        dest = (DEST_IP, UDP_PORT)
+        interval = BROADCAST_INTERVAL
+        keepalive = KEEPALIVE_SEC
+
+        def tick():
+            # finally re-arms even when a tick raises — otherwise one bad
+            # tick would silently end the chain while run_forever keeps
+            # the process alive. asyncio still logs the exception.
+            try:
+                packet = build_packet(get_telemetry())
+
+                self._tick_count += 1
+                if VERBOSE and self._tick_count % STATUS_EVERY_TICKS == 0:
+                    # One write() syscall, no flush-per-tick TTY churn
+                    os.write(1, (
+                        f"\r⚡ {packet['timestamp'][11:19]} | "
+                        f"War Chest ${packet['war_chest']:,.2f} | "
+                        f"Nodes {packet['active_nodes']}  "
+                    ).encode())
+
+                # Idle dedupe: skip serialization + send while nothing the
+                # dashboard renders has changed, modulo the keep-alive.
+                sig = signature(packet)
+                mono = monotonic()
+                if sig != self._last_sig or mono - self._last_sent >= keepalive:
+                    # orjson emits bytes directly — no .encode() pass
+                    try:
+                        sendto(dumps(packet), dest)
+                        self._last_sig = sig
+                        self._last_sent = mono
+                        self._last_send_errno = None
+                    except OSError as e:
+                        # Kernel buffer full, or Tailscale down
+                        # (ENETUNREACH/EHOSTUNREACH) — drop this
+                        # snapshot, the next one supersedes it. Log once
+                        # per distinct errno, not per tick.
+                        if e.errno != self._last_send_errno:
+                            self._last_send_errno = e.errno
+                            print(f"⚠️  send to {DEST_IP}:{UDP_PORT} failed: {e}",
+                                  file=sys.stderr)
+            finally:
+                call_later(interval, tick)
+
+        loop.call_soon(tick)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+
 def main():
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    strike_log = []
-    start_time = time.time()
+    dispatcher = Dispatcher()
 
     print(f"📡 Dispatcher Ignited | Target: {DEST_IP}:{UDP_PORT}")
     print(f"🔒 Security: Port {UDP_PORT} Active | Tailscale Ready")
     print(f"🎯 War Chest Goal: ${WAR_CHEST_GOAL:,.0f}")
 
-    while True:
-        nodes = get_telemetry()
-        packet = build_packet(nodes, start_time, strike_log)
-        data = json.dumps(packet).encode("utf-8")
-        sock.sendto(data, (DEST_IP, UDP_PORT))
-
-        # 500ms sync with Nova's pulse
-        time.sleep(0.5)
+    dispatcher.run()
 
 
 if __name__ == "__main__":
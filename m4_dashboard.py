@@ -219,7 +219,12 @@ class InfraredDashboard:
 
     def build_strike_log(self, packet: Dict) -> Panel:
         """Build the Strike Log panel."""
-        strikes = packet.get("strike_log", [])
+        strikes = packet.get("strike_log")
+        if strikes is None:
+            # Senders elide an unchanged log as null — keep the last one
+            strikes = self.strike_history
+        else:
+            self.strike_history = strikes
 
         if not strikes:
             content = Text("  Awaiting 3-SD wall hits...", style="dim italic")
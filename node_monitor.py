@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Per-node status readers for the M1 dispatcher.
+
+This is the dispatcher's hot path: one NodeMonitor per MT5 status file,
+re-parsing only when the file is actually rewritten and keeping a running
+latency-jitter window. The module is self-contained and fully typed so it
+can be AOT-compiled unchanged (``mypyc node_monitor.py`` or
+``cythonize -3 --inplace node_monitor.py``); the dispatcher imports it
+the same way either form.
+"""
+
+import os
+from collections import deque
+from math import sqrt
+from typing import Deque, Optional
+
+import orjson
+
+
+class JitterTracker:
+    """Running latency jitter (stddev) over a 20-sample window.
+
+    Welford's online algorithm with a reverse update on eviction — O(1)
+    per sample, no re-summation of the window each tick.
+    """
+
+    WINDOW = 20
+
+    __slots__ = ("samples", "_m", "_s", "_n")
+
+    def __init__(self) -> None:
+        self.samples: Deque[float] = deque(maxlen=self.WINDOW)
+        self._m = 0.0
+        self._s = 0.0
+        self._n = 0
+
+    def push(self, x: float) -> None:
+        if self._n == self.WINDOW:
+            old = self.samples[0]
+            m_prev = (self._n * self._m - old) / (self._n - 1)
+            self._s -= (old - self._m) * (old - m_prev)
+            self._m = m_prev
+            self._n -= 1
+        self.samples.append(x)
+        self._n += 1
+        d = x - self._m
+        self._m += d / self._n
+        self._s += d * (x - self._m)
+
+    def jitter(self) -> float:
+        if self._n == 0:
+            return 0.0
+        return sqrt(max(0.0, self._s / self._n))
+
+
+class NodeMonitor:
+    """Reads one node's status file, caching the parse between writes."""
+
+    __slots__ = (
+        "filename", "dir_fd", "node_key", "data", "mtime_ns", "size",
+        "tracker",
+    )
+
+    def __init__(self, filename: str, dir_fd: int) -> None:
+        self.filename = filename
+        self.dir_fd = dir_fd
+        self.node_key = filename.replace("_status.json", "")
+        self.data: Optional[dict] = None
+        self.mtime_ns = -1
+        self.size = -1
+        self.tracker = JitterTracker()
+
+    def read(self, st: os.stat_result, now: float) -> Optional[dict]:
+        """Return this node's status dict, or None if unreadable this tick.
+
+        ``st`` is the scandir-cached stat for the file; an unchanged
+        mtime/size serves the previous parse with only the file-age
+        latency refreshed.
+        """
+        if (
+            self.data is not None
+            and st.st_mtime_ns == self.mtime_ns
+            and st.st_size == self.size
+        ):
+            # Unwritten since last tick — only the file age moved
+            self.data["latency_ms"] = (now - st.st_mtime) * 1000.0
+            return self.data
+
+        # Relative open against the held directory fd — the kernel only
+        # resolves the basename, not the whole Wine path, every time.
+        try:
+            fd = os.open(self.filename, os.O_RDONLY, dir_fd=self.dir_fd)
+        except FileNotFoundError:
+            return None
+        try:
+            raw = os.read(fd, st.st_size)
+        finally:
+            os.close(fd)
+        latency_ms = (now - st.st_mtime) * 1000.0
+
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # File being written to by Nova — skip this cycle
+            return None
+
+        # Use the bot name from JSON, or derive from filename
+        bot_name = data.get("bot", self.filename.replace("_status.json", ""))
+        self.node_key = bot_name.lower().replace(" ", "_")
+        data["latency_ms"] = latency_ms
+        data.setdefault("status", "RUNNING")
+        data.setdefault("last_action", "—")
+        data.setdefault("current_pnl", 0.0)
+
+        # Nodes that don't report jitter get it measured here, sampled
+        # per write so idle file aging doesn't inflate the stddev
+        self.tracker.push(latency_ms)
+        data.setdefault("latency_jitter", self.tracker.jitter())
+
+        self.data = data
+        self.mtime_ns = st.st_mtime_ns
+        self.size = st.st_size
+        return data
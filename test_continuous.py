@@ -1,81 +1,431 @@
 #!/usr/bin/env python3
-"""Continuous test packet sender for Cauldron dashboard."""
+"""Continuous test packet sender for Cauldron dashboard.
+
+Also runs unmodified under PyPy (``pypy3 test_continuous.py``) for
+CPU-bound load generation — the tracing JIT makes the interpreted loop
+fast on its own, so that path uses stdlib json and skips numpy/numba.
+"""
 
 import socket
-import json
+import sys
 import time
 import random
+from collections import deque
 from datetime import datetime
 
+IS_PYPY = sys.implementation.name == 'pypy'
+
+if IS_PYPY:
+    # orjson wheels are spotty on PyPy and numpy is slow there; PyPy's
+    # own json is JIT-friendly and plenty fast for the strike list
+    import json
+
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    np = None
+else:
+    import orjson
+
+    _dumps = orjson.dumps
+
+    try:
+        import numpy as np
+    except ImportError:  # optional — scalar RNG still works
+        np = None
+
+DEST = ('127.0.0.1', 9999)
+
+# --- BATCHED RNG ---
+# ~15 random.uniform calls per packet each dispatch into the Mersenne
+# Twister; with numpy one vectorized refill covers 4096 draws.
+if np is not None:
+    _rng = np.random.default_rng()
+    _rand_buf = _rng.random(4096)
+    _rand_idx = 0
+
+    def draw():
+        global _rand_buf, _rand_idx
+        if _rand_idx >= 4096:
+            _rand_buf = _rng.random(4096)
+            _rand_idx = 0
+        v = _rand_buf[_rand_idx]
+        _rand_idx += 1
+        return v
+else:
+    draw = random.random
+
+
+def uniform(a, b):
+    return a + (b - a) * draw()
+
+
+# --- TIMESTAMP CACHE ---
+# datetime construction + isoformat/strftime only produce a new result
+# once per second; cache the formatted forms — the iso prefix already
+# encoded, since the packet renderer wants bytes — and append
+# microseconds per call.
+_last_sec = -1
+_iso_b = b''
+_hms_cached = ''
+
+
+def timestamps(now):
+    """Return (iso timestamp bytes with microseconds, HH:MM:SS) for ``now``."""
+    global _last_sec, _iso_b, _hms_cached
+    sec = int(now)
+    if sec != _last_sec:
+        iso = datetime.fromtimestamp(sec).isoformat()
+        _iso_b = iso.encode()
+        _hms_cached = iso[11:19]
+        _last_sec = sec
+    return b'%s.%06d' % (_iso_b, int((now - sec) * 1e6)), _hms_cached
+
+# --- SIMULATION STEP ---
+# Every number a packet needs comes out of one step() call. With numba
+# installed the whole body JIT-compiles to native code (it only uses
+# np.random + arithmetic), so a load-generation run with the sleep
+# removed pays one native call per packet instead of ~16 interpreted
+# RNG and arithmetic ops. Without numba an equivalent interpreted
+# version keeps the same call shape.
+try:
+    from numba import njit
+except ImportError:  # optional — interpreted fallback below
+    njit = None
+
+if njit is not None and np is not None:
+    @njit(cache=True)
+    def step(war_chest):
+        """Advance the simulated cell by one packet worth of numbers."""
+        war_chest = max(0.0, war_chest + np.random.uniform(-50.0, 150.0))
+        return (
+            war_chest,
+            np.random.uniform(3000.0, 6000.0),   # pnl1
+            np.random.uniform(4000.0, 8000.0),   # pnl2
+            np.random.uniform(1500.0, 4000.0),   # pnl3
+            np.random.uniform(3.0, 12.0),        # lat1
+            np.random.uniform(4.0, 15.0),        # lat2
+            np.random.uniform(2.0, 10.0),        # lat3
+            np.random.uniform(0.5, 2.0),         # jit1
+            np.random.uniform(0.3, 1.5),         # jit2
+            np.random.uniform(0.4, 1.8),         # jit3
+            np.random.uniform(4.0, 10.0),        # avg latency
+            np.random.uniform(15.0, 45.0),       # cpu
+            np.random.uniform(40.0, 60.0),       # ram
+            np.random.uniform(6.0, 10.0),        # ram used
+            np.random.random(),                  # strike roll
+            np.random.uniform(500.0, 3000.0),    # strike pnl
+        )
+else:
+    def step(war_chest):
+        """Advance the simulated cell by one packet worth of numbers."""
+        war_chest = max(0.0, war_chest + uniform(-50, 150))
+        return (
+            war_chest,
+            uniform(3000, 6000),   # pnl1
+            uniform(4000, 8000),   # pnl2
+            uniform(1500, 4000),   # pnl3
+            uniform(3, 12),        # lat1
+            uniform(4, 15),        # lat2
+            uniform(2, 10),        # lat3
+            uniform(0.5, 2),       # jit1
+            uniform(0.3, 1.5),     # jit2
+            uniform(0.4, 1.8),     # jit3
+            uniform(4, 10),        # avg latency
+            uniform(15, 45),       # cpu
+            uniform(40, 60),       # ram
+            uniform(6, 10),        # ram used
+            draw(),                # strike roll
+            uniform(500, 3000),    # strike pnl
+        )
+
+# --- BATCHED SEND ---
+# At 2 Hz each packet flushes immediately, but with the sleep shortened
+# for load testing the syscall per packet dominates; on Linux a whole
+# batch goes out in one sendmmsg(2).
+BATCH_SIZE = 32
+FLUSH_INTERVAL = 0.5
+
+if sys.platform == 'linux':
+    import ctypes
+
+    libc = ctypes.CDLL('libc.so.6', use_errno=True)
+
+    class iovec(ctypes.Structure):
+        _fields_ = [('iov_base', ctypes.c_void_p),
+                    ('iov_len', ctypes.c_size_t)]
+
+    class sockaddr_in(ctypes.Structure):
+        _fields_ = [('sin_family', ctypes.c_uint16),
+                    ('sin_port', ctypes.c_uint16),
+                    ('sin_addr', ctypes.c_ubyte * 4),
+                    ('sin_zero', ctypes.c_char * 8)]
+
+    class msghdr(ctypes.Structure):
+        _fields_ = [('msg_name', ctypes.c_void_p),
+                    ('msg_namelen', ctypes.c_uint32),
+                    ('msg_iov', ctypes.POINTER(iovec)),
+                    ('msg_iovlen', ctypes.c_size_t),
+                    ('msg_control', ctypes.c_void_p),
+                    ('msg_controllen', ctypes.c_size_t),
+                    ('msg_flags', ctypes.c_int)]
+
+    class mmsghdr(ctypes.Structure):
+        _fields_ = [('msg_hdr', msghdr),
+                    ('msg_len', ctypes.c_uint32)]
+
+    _SADDR = sockaddr_in(
+        socket.AF_INET,
+        socket.htons(DEST[1]),
+        (ctypes.c_ubyte * 4)(*socket.inet_aton(DEST[0])),
+    )
+
+    # One sockaddr + fixed iovec/mmsghdr arrays, built once: every slot
+    # already points at _SADDR and its own iovec, so a flush touches only
+    # iov_base/iov_len — no ctypes allocation per batch
+    _IOVS = (iovec * BATCH_SIZE)()
+    _MSGS = (mmsghdr * BATCH_SIZE)()
+    for _i in range(BATCH_SIZE):
+        _MSGS[_i].msg_hdr.msg_name = ctypes.addressof(_SADDR)
+        _MSGS[_i].msg_hdr.msg_namelen = ctypes.sizeof(_SADDR)
+        _MSGS[_i].msg_hdr.msg_iov = ctypes.pointer(_IOVS[_i])
+        _MSGS[_i].msg_hdr.msg_iovlen = 1
+    del _i
+
+    def flush(sock, pending):
+        """Send every pending (buffer, used-length) datagram in one sendmmsg(2)."""
+        n = len(pending)
+        anchors = []
+        for i, (buf, used) in enumerate(pending):
+            c = ctypes.c_char.from_buffer(buf)
+            anchors.append(c)
+            _IOVS[i].iov_base = ctypes.addressof(c)
+            _IOVS[i].iov_len = used
+        # anchors/pending pin the buffers until the syscall returns
+        if libc.sendmmsg(sock.fileno(), _MSGS, n, 0) < 0:
+            raise OSError(ctypes.get_errno(), 'sendmmsg failed')
+        del anchors
+        pending.clear()
+else:
+    def flush(sock, pending):
+        """No sendmmsg off Linux — fall back to one send per datagram."""
+        for buf, used in pending:
+            sock.send(memoryview(buf)[:used])
+        pending.clear()
+
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+# Connected UDP — the kernel caches the destination so each send skips
+# the address tuple -> sockaddr conversion, and a roomy SO_SNDBUF keeps
+# batch flushes from blocking on a full kernel buffer.
+sock.connect(DEST)
+sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
 start = time.time()
 war_chest = 12500.50
-strikes = []
+# maxlen evicts the oldest strike in O(1) — no rebuilt [-10:] slice
+strikes = deque(maxlen=10)
+# Full strike_log keyframe cadence; between keyframes an unchanged log
+# serializes as null and the dashboard keeps showing its last state
+KEYFRAME_SEC = 30.0
 
 actions = ['BUY XAUUSD @ 2655', 'SELL XAUUSD @ 2658', 'HOLD — thesis intact',
            'WAIT — no setup', 'TP1 hit — trailing', 'CLOSE_PARTIAL 25%']
 strike_actions = ['TP1 hit @ 2660', '3-SD wall bounce', 'Breakeven trail', 'Full TP @ 2675']
+NODE_NAMES = ['node_1', 'node_2', 'node_3']
 
-print('Sending packets to dashboard... (Ctrl+C to stop)')
+# --- REUSED OUTPUT BUFFERS ---
+# Instead of materializing a fresh ~700-byte packet per iteration, each
+# one renders into a persistent bytearray from a small pool (one per
+# batch slot, so batching never overwrites a still-pending packet).
+# Every dynamic field is fixed-width — JSON treats the padding spaces
+# before a number as insignificant whitespace, and the action strings
+# (no quotes or backslashes) are space-padded to a common width — so
+# each lands at
+# an offset computed once at import. strike_log sits last, so only the
+# tail varies and the send is a zero-copy memoryview slice.
+# Pad after encoding — the em-dash actions are longer in bytes than in
+# characters, and the slot width has to be exact in bytes
+_acts_b = [a.encode() for a in actions]
+_ACT_W = max(len(b) for b in _acts_b)
+ACTIONS_PAD = [b.ljust(_ACT_W) for b in _acts_b]
+del _acts_b
 
-i = 0
-try:
-    while True:
-        i += 1
-        uptime = time.time() - start + 3600
-
-        # Simulate P&L movement
-        war_chest += random.uniform(-50, 150)
-        war_chest = max(0, war_chest)
-
-        pnl1 = random.uniform(3000, 6000)
-        pnl2 = random.uniform(4000, 8000)
-        pnl3 = random.uniform(1500, 4000)
-
-        # Random strike every ~10 packets
-        if random.random() < 0.1:
-            strikes.append({
-                'time': datetime.now().strftime('%H:%M:%S'),
-                'node': random.choice(['node_1', 'node_2', 'node_3']),
-                'pnl': random.randint(500, 3000),
-                'action': random.choice(strike_actions)
-            })
-            strikes = strikes[-10:]
-
-        packet = {
-            'timestamp': datetime.now().isoformat(),
-            'uptime_sec': uptime,
-            'war_chest': round(war_chest, 2),
-            'war_chest_goal': 100000,
-            'progress_pct': round(war_chest / 1000, 2),
-            'nodes': {
-                'node_1': {'status': 'RUNNING', 'last_action': random.choice(actions),
-                          'current_pnl': round(pnl1, 2), 'latency_ms': round(random.uniform(3, 12), 1),
-                          'latency_jitter': round(random.uniform(0.5, 2), 1)},
-                'node_2': {'status': 'RUNNING', 'last_action': random.choice(actions),
-                          'current_pnl': round(pnl2, 2), 'latency_ms': round(random.uniform(4, 15), 1),
-                          'latency_jitter': round(random.uniform(0.3, 1.5), 1)},
-                'node_3': {'status': 'RUNNING', 'last_action': random.choice(actions),
-                          'current_pnl': round(pnl3, 2), 'latency_ms': round(random.uniform(2, 10), 1),
-                          'latency_jitter': round(random.uniform(0.4, 1.8), 1)}
-            },
-            'active_nodes': 3,
-            'avg_latency_ms': round(random.uniform(4, 10), 1),
-            'system': {
-                'cpu_percent': round(random.uniform(15, 45), 1),
-                'ram_percent': round(random.uniform(40, 60), 1),
-                'ram_used_gb': round(random.uniform(6, 10), 1),
-                'ram_total_gb': 16.0
-            },
-            'strike_log': strikes
-        }
-
-        sock.sendto(json.dumps(packet).encode(), ('127.0.0.1', 9999))
-
-        if i % 10 == 0:
-            print(f'  Packet {i}: War Chest ${war_chest:,.2f} | Strikes: {len(strikes)}')
-
-        time.sleep(0.5)  # 2Hz
-
-except KeyboardInterrupt:
-    print(f'\nStopped after {i} packets.')
+_LAYOUT = []   # (offset, width, fmt) per dynamic field, in render order
+_parts = []
+_pos = 0
+
+
+def _const(b):
+    global _pos
+    _parts.append(b)
+    _pos += len(b)
+
+
+def _field(width, fmt=None):
+    global _pos
+    _LAYOUT.append((_pos, width, fmt))
+    _parts.append(b' ' * width)
+    _pos += width
+
+
+_const(b'{"timestamp":"')
+_field(26)                               # YYYY-MM-DDTHH:MM:SS.ffffff
+_const(b'","uptime_sec":')
+_field(12, b'%12.1f')
+_const(b',"war_chest":')
+_field(14, b'%14.2f')
+_const(b',"war_chest_goal":100000,"progress_pct":')
+_field(10, b'%10.2f')
+_const(b',"nodes":{')
+for _name in (b'node_1', b'node_2', b'node_3'):
+    if _name != b'node_1':
+        _const(b',')
+    _const(b'"' + _name + b'":{"status":"RUNNING","last_action":"')
+    _field(_ACT_W)
+    _const(b'","current_pnl":')
+    _field(12, b'%12.2f')
+    _const(b',"latency_ms":')
+    _field(8, b'%8.1f')
+    _const(b',"latency_jitter":')
+    _field(8, b'%8.1f')
+    _const(b'}')
+_const(b'},"active_nodes":3,"avg_latency_ms":')
+_field(8, b'%8.1f')
+_const(b',"system":{"cpu_percent":')
+_field(7, b'%7.1f')
+_const(b',"ram_percent":')
+_field(7, b'%7.1f')
+_const(b',"ram_used_gb":')
+_field(7, b'%7.1f')
+_const(b',"ram_total_gb":16.0},"strike_log":')
+
+_PREFIX = b''.join(_parts)
+_STRIKE_OFF = len(_PREFIX)
+del _parts, _pos, _name
+
+_POOL = []
+for _ in range(BATCH_SIZE):
+    _b = bytearray(_STRIKE_OFF + 1024)
+    _b[:_STRIKE_OFF] = _PREFIX
+    _POOL.append(_b)
+del _b
+
+
+def render(buf, values, strike_bytes):
+    """Write one packet into ``buf``; returns the used byte length."""
+    for (off, width, fmt), v in zip(_LAYOUT, values):
+        buf[off:off + width] = v if fmt is None else fmt % v
+    end = _STRIKE_OFF + len(strike_bytes)
+    buf[_STRIKE_OFF:end] = strike_bytes
+    buf[end] = 0x7D  # closing '}'
+    return end + 1
+
+def main():
+    global war_chest
+
+    # Hot-loop bindings: inside a function these are LOAD_FAST locals
+    # instead of LOAD_GLOBAL/LOAD_METHOD lookups per call (at module
+    # scope the rebinding would buy nothing)
+    sim = step
+    choice = random.choice
+    dumps = _dumps
+    stamp = timestamps
+    wall = time.time
+    mono = time.monotonic
+    sleep = time.sleep
+    pool = _POOL
+    acts = ACTIONS_PAD
+    draw_packet = render
+    send_batch = flush
+    pending = []
+    append = pending.append
+
+    print('Sending packets to dashboard... (Ctrl+C to stop)')
+
+    i = 0
+    last_flush = mono()
+    strikes_version = 0
+    sent_version = -1   # forces a full strike_log in the first packet
+    last_keyframe = 0.0
+    # Absolute deadlines: sleeping the *remainder* of each 0.5 s slot
+    # keeps the cadence at an exact 2 Hz instead of drifting by however
+    # long the packet build took
+    next_t = mono()
+    try:
+        while True:
+            i += 1
+            now = wall()
+            uptime = now - start + 3600
+            ts_iso, ts_hms = stamp(now)
+
+            # One call covers the whole simulation — P&L movement, node
+            # draws, system stats and the strike roll
+            (war_chest, pnl1, pnl2, pnl3,
+             lat1, lat2, lat3, jit1, jit2, jit3,
+             avg_lat, cpu, ram, ram_used,
+             strike_roll, strike_pnl) = sim(war_chest)
+
+            # Random strike every ~10 packets
+            if strike_roll < 0.1:
+                strikes.append({
+                    'time': ts_hms,
+                    'node': choice(NODE_NAMES),
+                    'pnl': int(strike_pnl),
+                    'action': choice(strike_actions)
+                })
+                strikes_version += 1
+
+            # Serialize the full log (orjson doesn't take deques) only
+            # when it changed or a keyframe is due; otherwise 4 bytes of
+            # null replace up to ~600 bytes of unchanged entries
+            if strikes_version != sent_version or now - last_keyframe >= KEYFRAME_SEC:
+                strike_bytes = dumps(list(strikes))
+                sent_version = strikes_version
+                last_keyframe = now
+            else:
+                strike_bytes = b'null'
+
+            # Render straight into this tick's pool buffer; the %.2f/%.1f
+            # field formats round during formatting, so the raw floats go
+            # in as-is — no round() pass over 20 fields
+            buf = pool[i % BATCH_SIZE]
+            used = draw_packet(buf, (
+                ts_iso,
+                uptime,
+                war_chest,
+                war_chest / 1000,
+                choice(acts),
+                pnl1,
+                lat1,
+                jit1,
+                choice(acts),
+                pnl2,
+                lat2,
+                jit2,
+                choice(acts),
+                pnl3,
+                lat3,
+                jit3,
+                avg_lat,
+                cpu,
+                ram,
+                ram_used,
+            ), strike_bytes)
+            append((buf, used))
+            if len(pending) >= BATCH_SIZE or mono() - last_flush >= FLUSH_INTERVAL:
+                send_batch(sock, pending)
+                last_flush = mono()
+
+            if i % 10 == 0:
+                print(f'  Packet {i}: War Chest ${war_chest:,.2f} | Strikes: {len(strikes)}')
+
+            next_t += 0.5  # 2Hz
+            delay = next_t - mono()
+            if delay > 0:
+                sleep(delay)
+
+    except KeyboardInterrupt:
+        print(f'\nStopped after {i} packets.')
+
+
+if __name__ == '__main__':
+    main()
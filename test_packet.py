@@ -2,11 +2,13 @@
 """Test packet sender for Cauldron dashboard."""
 
 import socket
-import json
 from datetime import datetime
 
+import orjson
+
 packet = {
-    'timestamp': datetime.now().isoformat(),
+    # orjson serializes the datetime natively — no isoformat() pass
+    'timestamp': datetime.now(),
     'uptime_sec': 3661,
     'war_chest': 25000.00,
     'progress_pct': 25.0,
@@ -22,5 +24,8 @@ packet = {
 }
 
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-sock.sendto(json.dumps(packet).encode(), ('127.0.0.1', 9999))
+# Connected UDP — the kernel caches the destination, so send() skips the
+# per-call address tuple -> sockaddr conversion
+sock.connect(('127.0.0.1', 9999))
+sock.send(orjson.dumps(packet))
 print('Packet sent to 127.0.0.1:9999')